@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Batch analysis of recorded runs
+
+Analyzes many capture files in parallel and merges the per-file results
+into one summary table. Results are cached by analysis version and file
+content hash, so re-running after adding new captures only processes the
+new files, and changing the analysis reprocesses all of them.
+"""
+
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from capture import load_capture, load_memory_samples
+
+# Bump when analyze_capture_file changes, so cached results are recomputed
+ANALYSIS_VERSION = 2
+
+SUMMARY_COLUMNS = [
+    'file', 'edges', 'duration_s', 'frequency', 'avg_interval', 'min_interval',
+    'max_interval', 'rapid_sequences', 'memory_spikes', 'min_mb', 'max_mb',
+    'avg_mb', 'samples'
+]
+
+def file_hash(path):
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def analyze_capture_file(path):
+    """Analyze a single capture file, returns a summary row"""
+    windows = load_capture(path)
+
+    # Intervals are only measured within a window, never across the
+    # uncaptured gap between two windows
+    interval_blocks = [np.diff(np.array([edge[0] for edge in window['edges']], dtype=float)) * 1000
+                       for window in windows]
+    intervals = np.concatenate(interval_blocks) if interval_blocks else np.array([])
+    edge_count = sum(len(window['edges']) for window in windows)
+    rss_values = [sample['rss'] for sample in load_memory_samples(path)]
+    reasons = [trigger['reason'] for window in windows for trigger in window['triggers']]
+
+    row = {
+        'file': path,
+        'edges': edge_count,
+        'duration_s': float(sum(window['end'] - window['start'] for window in windows)),
+        'frequency': 0.0,
+        'avg_interval': 0.0,
+        'min_interval': 0.0,
+        'max_interval': 0.0,
+        # Detections are recorded by the live analyzer as window triggers
+        'rapid_sequences': reasons.count('rapid_sequence'),
+        'memory_spikes': reasons.count('memory_spike'),
+        'min_mb': 0.0,
+        'max_mb': 0.0,
+        'avg_mb': 0.0,
+        'samples': len(rss_values)
+    }
+
+    # Same statistics as analyze_toggle_pattern, over the captured windows
+    if len(intervals):
+        row['avg_interval'] = float(intervals.mean())
+        row['min_interval'] = float(intervals.min())
+        row['max_interval'] = float(intervals.max())
+        row['frequency'] = 1000 / row['avg_interval'] if row['avg_interval'] > 0 else 0.0
+
+    if rss_values:
+        row['min_mb'] = min(rss_values) / (1024 * 1024)
+        row['max_mb'] = max(rss_values) / (1024 * 1024)
+        row['avg_mb'] = sum(rss_values) / len(rss_values) / (1024 * 1024)
+
+    return row
+
+def load_cache(cache_file):
+    """Load cached per-file results"""
+    try:
+        if os.path.exists(cache_file):
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    except Exception as e:
+        print(f"Error reading cache file: {e}")
+    return {}
+
+def save_cache(cache, cache_file):
+    """Save cached per-file results"""
+    try:
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+    except Exception as e:
+        print(f"Error writing cache file: {e}")
+
+def find_capture_files(paths):
+    """Expand directories to the capture files they contain"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '*.jsonl'))))
+        else:
+            files.append(path)
+    return files
+
+def run_batch(paths, cache_file='batch_cache.json', jobs=None):
+    """Analyze capture files in a process pool, returns (rows, files processed)"""
+    files = find_capture_files(paths)
+    cache = load_cache(cache_file)
+
+    keys = {path: f"{ANALYSIS_VERSION}:{file_hash(path)}" for path in files}
+    pending = [path for path in files if keys[path] not in cache]
+    processed = 0
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {path: executor.submit(analyze_capture_file, path)
+                       for path in pending}
+            for path, future in futures.items():
+                try:
+                    cache[keys[path]] = future.result()
+                    processed += 1
+                except Exception as e:
+                    print(f"Error analyzing {path}: {e}")
+        save_cache(cache, cache_file)
+
+    rows = []
+    for path in files:
+        if keys[path] in cache:
+            # The same content may be cached under another name
+            rows.append(dict(cache[keys[path]], file=path))
+    return rows, processed
+
+def write_summary_csv(rows, output_file):
+    """Write the summary table as CSV"""
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def print_summary(rows):
+    """Print the summary table"""
+    print(f"{'File':<40} {'Edges':>10} {'Freq (Hz)':>10} {'Avg (ms)':>10} "
+          f"{'Rapid':>7} {'Spikes':>7} {'Max MB':>8}")
+    for row in rows:
+        print(f"{os.path.basename(row['file']):<40} {row['edges']:>10} "
+              f"{row['frequency']:>10.1f} {row['avg_interval']:>10.2f} "
+              f"{row['rapid_sequences']:>7} {row['memory_spikes']:>7} {row['max_mb']:>8.1f}")
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Analyze many recorded DIO runs in parallel')
+    parser.add_argument('paths', nargs='+', help='Capture files or directories of capture files')
+    parser.add_argument('--csv', help='Write the summary table to this CSV file')
+    parser.add_argument('--cache', default='batch_cache.json', help='Per-file result cache')
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes (default: CPU count)')
+    args = parser.parse_args()
+
+    rows, processed = run_batch(args.paths, cache_file=args.cache, jobs=args.jobs)
+
+    print(f"Analyzed {processed} new file(s), {len(rows) - processed} from cache")
+    print_summary(rows)
+
+    if args.csv:
+        write_summary_csv(rows, args.csv)
+        print(f"✅ Summary written to {args.csv}")
+
+if __name__ == "__main__":
+    main()
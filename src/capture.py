@@ -0,0 +1,219 @@
+import json
+import os
+from collections import deque
+
+
+class CaptureBuffer:
+    """Keep recent edges and memory samples in memory and persist only the
+    windows surrounding detected events.
+
+    Edges and memory samples go into fixed-size ring buffers. When a trigger
+    fires, a window from ``pre_trigger_ms`` before it to ``post_trigger_ms``
+    after it is scheduled; triggers whose windows overlap are merged into a
+    single window. Once the post-trigger period has elapsed the window is
+    appended to the capture file as one JSON line. Windows that keep being
+    extended are split every ``max_window_ms`` so they cannot outgrow the
+    ring buffers.
+
+    On close, the full memory sample history of the run can be appended as a
+    single ``memory`` record, so memory timelines are not limited to the
+    trigger windows.
+    """
+
+    def __init__(self, capture_file='capture.jsonl', pre_trigger_ms=500,
+                 post_trigger_ms=500, max_window_ms=10000, max_edges=100000,
+                 max_samples=10000):
+        self.capture_file = capture_file
+        self.pre_trigger = pre_trigger_ms / 1000.0  # Convert to seconds
+        self.post_trigger = post_trigger_ms / 1000.0
+        self.max_window = max_window_ms / 1000.0
+
+        # Ring buffers - oldest entries are dropped once full
+        self.edges = deque(maxlen=max_edges)
+        self.memory_samples = deque(maxlen=max_samples)
+
+        # Window currently being collected (None when idle)
+        self.window = None
+        # End of the last persisted window, so merged/adjacent windows
+        # never write the same edge twice
+        self.persisted_until = None
+        # Last record written and where it starts in the file, so triggers
+        # falling entirely in persisted time can be attached to it
+        self.last_record = None
+        self.last_record_offset = None
+
+        # Statistics
+        self.windows_written = 0
+        self.edges_written = 0
+        self.triggers_received = 0
+
+    def record_edge(self, timestamp, state=None):
+        """Record a single edge in the ring buffer"""
+        self.edges.append((timestamp, state))
+
+    def record_memory(self, sample):
+        """Record a memory sample (a HeapMonitor heap_sizes entry)"""
+        self.memory_samples.append(sample)
+
+    def trigger(self, timestamp, reason):
+        """Schedule the window around an event for persisting"""
+        self.triggers_received += 1
+        start = timestamp - self.pre_trigger
+        end = timestamp + self.post_trigger
+
+        if self.window is not None and start <= self.window['end']:
+            # Overlapping trigger - extend the open window
+            self.window['end'] = max(self.window['end'], end)
+            self.window['triggers'].append({'timestamp': timestamp, 'reason': reason})
+            return
+
+        if self.window is not None:
+            # Previous window does not overlap, persist it before starting anew
+            self._write_window()
+
+        if self.persisted_until is not None:
+            start = max(start, self.persisted_until)
+            if start >= end:
+                # The whole window has been persisted already
+                self._attach_to_last_record({'timestamp': timestamp, 'reason': reason})
+                return
+
+        self.window = {
+            'start': start,
+            'end': end,
+            'triggers': [{'timestamp': timestamp, 'reason': reason}]
+        }
+
+    def poll(self, current_time):
+        """Persist the open window once its post-trigger period has elapsed"""
+        if self.window is None:
+            return
+
+        if current_time > self.window['end']:
+            self._write_window()
+        elif current_time - self.window['start'] >= self.max_window:
+            # Persist what has been collected so far and continue in a new window
+            end = self.window['end']
+            self.window['end'] = current_time
+            self._write_window()
+            self.window = {'start': current_time, 'end': end, 'triggers': []}
+
+    def close(self, memory_samples=None):
+        """Persist any open window, even if its post-trigger period is incomplete
+
+        memory_samples, if given, is the run's full memory sample history and
+        is written after the last window.
+        """
+        if self.window is not None:
+            self._write_window()
+
+        if memory_samples is not None:
+            try:
+                with open(self.capture_file, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({'type': 'memory', 'samples': list(memory_samples)}) + '\n')
+            except Exception as e:
+                print(f"Error writing capture file: {e}")
+
+    def _write_window(self):
+        """Append the open window to the capture file"""
+        window = self.window
+        self.window = None
+        start, end = window['start'], window['end']
+        # Anything up to the previous window's end has already been written
+        after = self.persisted_until if self.persisted_until is not None else float('-inf')
+
+        edges = [[t, state] for t, state in self.edges
+                 if start <= t <= end and t > after]
+        memory = [sample for sample in self.memory_samples
+                  if start <= sample['timestamp'] <= end and sample['timestamp'] > after]
+
+        record = {
+            'type': 'window',
+            'start': start,
+            'end': end,
+            'triggers': window['triggers'],
+            'edges': edges,
+            'memory': memory
+        }
+
+        try:
+            capture_dir = os.path.dirname(self.capture_file) if os.path.dirname(self.capture_file) else '.'
+            if not os.path.exists(capture_dir):
+                os.makedirs(capture_dir)
+
+            with open(self.capture_file, 'a', encoding='utf-8') as f:
+                self.last_record_offset = f.tell()
+                f.write(json.dumps(record) + '\n')
+            self.last_record = record
+
+            self.windows_written += 1
+            self.edges_written += len(edges)
+        except Exception as e:
+            print(f"Error writing capture file: {e}")
+
+        self.persisted_until = end
+
+    def _attach_to_last_record(self, trigger):
+        """Add a trigger to the last record written by rewriting it in place"""
+        if self.last_record is None:
+            return
+
+        self.last_record['triggers'].append(trigger)
+        try:
+            with open(self.capture_file, 'r+', encoding='utf-8') as f:
+                f.seek(self.last_record_offset)
+                f.truncate()
+                f.write(json.dumps(self.last_record) + '\n')
+        except Exception as e:
+            print(f"Error writing capture file: {e}")
+
+    def get_stats(self):
+        """Get statistics about the capture"""
+        return {
+            'windows_written': self.windows_written,
+            'edges_written': self.edges_written,
+            'triggers_received': self.triggers_received
+        }
+
+
+def clear_capture_file(capture_file):
+    """Remove a previous run's capture file"""
+    try:
+        if os.path.exists(capture_file):
+            os.remove(capture_file)
+            print(f"Capture file {capture_file} cleared")
+    except Exception as e:
+        print(f"Error clearing capture file: {e}")
+
+
+def _load_records(capture_file):
+    """Load all records from a capture file"""
+    records = []
+    with open(capture_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    return records
+
+
+def load_capture(capture_file):
+    """Load all windows from a capture file"""
+    return [record for record in _load_records(capture_file)
+            if record.get('type', 'window') == 'window']
+
+
+def load_memory_samples(capture_file):
+    """Load the memory samples of a whole run from a capture file
+
+    Falls back to the samples inside the trigger windows for captures
+    closed without a memory history.
+    """
+    records = _load_records(capture_file)
+    samples = [sample for record in records if record.get('type') == 'memory'
+               for sample in record['samples']]
+    if not samples:
+        samples = [sample for record in records if record.get('type', 'window') == 'window'
+                   for sample in record['memory']]
+    samples.sort(key=lambda sample: sample['timestamp'])
+    return samples
@@ -0,0 +1,116 @@
+import time
+from collections import deque
+
+
+class ClockAligner:
+    """Map device sample-clock time onto host time.
+
+    Sync points pair a device clock reading with the host monotonic time
+    taken around it. A least-squares line through the most recent points
+    gives the offset and drift between the two clocks, so edge timestamps
+    from the device can be converted to host time and compared with memory
+    samples. Host wall time is derived from the monotonic clock with a
+    single anchor taken at startup, so wall clock adjustments during a run
+    do not distort intervals.
+
+    Device readings that do not advance past the previous sync point are
+    rejected. While the device clock is stale the aligner reports itself as
+    not synced, so callers fall back to host timestamps.
+    """
+
+    def __init__(self, sync_interval=1.0, max_points=32):
+        self.sync_interval = sync_interval
+        self.points = deque(maxlen=max_points)  # (device_time, host_monotonic)
+        self.wall_offset = time.time() - time.monotonic()
+        self.last_sync = None
+        self.stale = False
+        self.rejected_points = 0
+
+        # Fitted model: host = host_ref + slope * (device - device_ref)
+        self.device_ref = None
+        self.host_ref = None
+        self.slope = 1.0
+
+    def host_time(self):
+        """Current host time in seconds since the epoch, from the monotonic clock"""
+        return time.monotonic() + self.wall_offset
+
+    def is_synced(self):
+        """Check if device time can currently be mapped to host time"""
+        return self.device_ref is not None and not self.stale
+
+    def needs_sync(self, now_monotonic=None):
+        """Check if a new sync point is due"""
+        if self.last_sync is None:
+            return True
+        if now_monotonic is None:
+            now_monotonic = time.monotonic()
+        return now_monotonic - self.last_sync >= self.sync_interval
+
+    def sync(self, read_device_time):
+        """Record a sync point using a callable that returns device time in seconds"""
+        before = time.monotonic()
+        device_time = read_device_time()
+        after = time.monotonic()
+
+        self.last_sync = after
+        if device_time is None:
+            return False
+
+        # The device was read somewhere between before and after
+        return self.add_sync_point(device_time, (before + after) / 2)
+
+    def add_sync_point(self, device_time, host_monotonic):
+        """Add a sync point and refit offset and drift
+
+        Returns False and marks the device clock stale if device_time does
+        not advance past the previous sync point.
+        """
+        if self.points and device_time <= self.points[-1][0]:
+            self.rejected_points += 1
+            self.stale = True
+            return False
+            
+        self.stale = False
+        self.points.append((device_time, host_monotonic))
+        self._fit()
+        return True
+
+    def _fit(self):
+        """Least-squares fit of host monotonic time against device time"""
+        n = len(self.points)
+        # Centre on the means to keep precision with epoch-sized values
+        device_mean = sum(d for d, _ in self.points) / n
+        host_mean = sum(h for _, h in self.points) / n
+
+        self.device_ref = device_mean
+        self.host_ref = host_mean
+
+        if n < 2:
+            self.slope = 1.0
+            return
+
+        covariance = sum((d - device_mean) * (h - host_mean) for d, h in self.points)
+        variance = sum((d - device_mean) ** 2 for d, _ in self.points)
+        self.slope = covariance / variance if variance > 0 else 1.0
+
+    def to_monotonic(self, device_time):
+        """Convert device time to host monotonic time"""
+        return self.host_ref + self.slope * (device_time - self.device_ref)
+
+    def to_host_time(self, device_time):
+        """Convert device time to host time in seconds since the epoch"""
+        return self.to_monotonic(device_time) + self.wall_offset
+
+    def get_alignment(self):
+        """Get the current offset and drift between device and host clocks"""
+        if self.device_ref is None:
+            return None
+
+        return {
+            'offset_s': self.host_ref - self.device_ref,
+            'drift_ppm': (self.slope - 1.0) * 1e6,
+            'sync_points': len(self.points),
+            'rejected_points': self.rejected_points,
+            'stale': self.stale
+        }
@@ -1,6 +1,9 @@
 import time
+import random
+import numpy as np
 try:
-    from pydwf import DwfLibrary, DwfEnumConfigInfo
+    from pydwf import (DwfLibrary, DwfEnumConfigInfo, DwfAcquisitionMode, DwfTriggerSource,
+                       DwfState)
     from pydwf.core import api as dwf
     PYDWF_AVAILABLE = True
 except ImportError:
@@ -8,17 +11,27 @@ except ImportError:
     PYDWF_AVAILABLE = False
 
 class DIOReader:
-    def __init__(self, pin=0):
+    def __init__(self, pin=0, sample_rate=1_000_000):
         self.pin = pin
         self.device = None
         self.last_state = None
         self.is_reading = False
         
+        # DigitalIn record-mode acquisition - edges are timestamped on the
+        # device sample clock as start time + sample index / sample rate
+        self.sample_rate = sample_rate
+        self.acquisition_running = False
+        self.acquisition_start = None  # Device time of the first sample
+        self.sample_count = 0  # Samples acquired so far, including lost ones
+        self.samples_lost = 0
+        self.pending_edges = []  # Decoded (device_time, state) not yet returned
+        self.sim_start = None
+        
         if PYDWF_AVAILABLE:
             try:
                 # Initialize Digilent device
                 dwf_library = DwfLibrary()
-                self.device = dwf_library.device.open()
+                self.device = dwf_library.deviceControl.open(-1)  # First available device
                 print(f"Successfully connected to Digilent device")
             except Exception as e:
                 print(f"Failed to connect to Digilent device: {e}")
@@ -32,18 +45,62 @@ class DIOReader:
         self.is_reading = True
         if self.device:
             try:
-                # Configure the DIO pin as input
-                self.device.digital_io.output_enable_set(1 << self.pin, 0)  # Set as input
+                # Configure the DIO pin as input, leaving the other pins as they are
+                digital_io = self.device.digitalIO
+                digital_io.outputEnableSet(digital_io.outputEnableGet() & ~(1 << self.pin))
                 # Read initial state
                 self.last_state = self._read_pin_state()
                 print(f"DIO pin {self.pin} initialized for reading")
             except Exception as e:
                 print(f"Error initializing DIO pin: {e}")
                 self.device = None
+        
+        self._start_acquisition()
+
+    def _start_acquisition(self):
+        """Start a continuous DigitalIn acquisition to timestamp edges"""
+        self.sample_count = 0
+        self.pending_edges = []
+        
+        if not self.device:
+            # Simulation mode - a sample counter driven by perf_counter, with
+            # its own time origin like a real device clock
+            self.sim_start = time.perf_counter()
+            self.acquisition_start = 0.0
+            if self.last_state is None:
+                self.last_state = False
+            self.acquisition_running = True
+            return
+            
+        try:
+            digital_in = self.device.digitalIn
+            digital_in.reset()
+            internal_clock = digital_in.internalClockInfo()
+            divider = max(1, round(internal_clock / self.sample_rate))
+            digital_in.dividerSet(divider)
+            self.sample_rate = internal_clock / divider
+            digital_in.sampleFormatSet(16)
+            digital_in.acquisitionModeSet(DwfAcquisitionMode.Record)
+            # Start recording immediately. In record mode the samples after the
+            # trigger are the record length, DigitalIn has no separate setter,
+            # so record as long as the device allows and restart when done
+            digital_in.triggerSourceSet(DwfTriggerSource.None_)
+            digital_in.triggerPositionSet(digital_in.triggerPositionInfo())
+            digital_in.configure(False, True)
+            
+            # The first fetch anchors sample 0 to the device clock
+            self.acquisition_start = None
+            self.acquisition_running = True
+            self._fetch_samples()
+            print(f"Sample clock acquisition running at {self.sample_rate/1e6:.3f} MHz")
+        except Exception as e:
+            print(f"Sample clock acquisition unavailable, using host timestamps: {e}")
+            self.acquisition_running = False
 
     def stop_reading(self):
         """Stop reading and close the device"""
         self.is_reading = False
+        self.acquisition_running = False
         if self.device:
             try:
                 self.device.close()
@@ -56,14 +113,14 @@ class DIOReader:
         if self.device:
             try:
                 # Read the digital input state
-                state = self.device.digital_io.input_status()
+                self.device.digitalIO.status()
+                state = self.device.digitalIO.inputStatus()
                 return bool(state & (1 << self.pin))
             except Exception as e:
                 print(f"Error reading DIO pin: {e}")
                 return None
         else:
             # Simulation mode - generate random toggles occasionally
-            import random
             if random.random() < 0.1:  # 10% chance of toggle
                 return not self.last_state if self.last_state is not None else True
             return self.last_state
@@ -86,6 +143,98 @@ class DIOReader:
         self.last_state = current_state
         return False
 
+    def _fetch_samples(self):
+        """Fetch samples acquired since the last fetch and decode their edges"""
+        if self.device:
+            digital_in = self.device.digitalIn
+            state = digital_in.status(True)
+            available, lost, corrupted = digital_in.statusRecord()
+            
+            if self.acquisition_start is None:
+                # statusTime is the device time of this status request, which
+                # follows the last sample received
+                sec_utc, tick, ticks_per_second = digital_in.statusTime()
+                if sec_utc == 0:
+                    raise RuntimeError("acquisition start time not available")
+                self.acquisition_start = (sec_utc + tick / ticks_per_second
+                                          - (available + lost) / self.sample_rate)
+            
+            # Lost samples precede the available ones and still take up time
+            self.sample_count += lost
+            self.samples_lost += lost
+            
+            if available:
+                samples = np.asarray(digital_in.statusData(available, 16))
+                self._decode_edges(((samples >> self.pin) & 1).astype(np.int8))
+            
+            if state == DwfState.Done:
+                # The record reached its maximum length - start a new one,
+                # anchored again on its first fetch
+                digital_in.configure(False, True)
+                self.acquisition_start = None
+                self.sample_count = 0
+        else:
+            # Simulation mode - occasionally toggle at a random sample index
+            total = int((time.perf_counter() - self.sim_start) * self.sample_rate)
+            new_samples = total - self.sample_count
+            if new_samples <= 0:
+                return
+            if random.random() < 0.1:  # 10% chance of toggle
+                index = self.sample_count + random.randrange(new_samples)
+                self.last_state = not self.last_state
+                self.pending_edges.append((self.acquisition_start + index / self.sample_rate,
+                                           self.last_state))
+            self.sample_count = total
+
+    def _decode_edges(self, levels):
+        """Queue the edges in a block of pin levels with their device times"""
+        previous = levels[0] if self.last_state is None else int(self.last_state)
+        changes = np.flatnonzero(np.diff(np.concatenate(([previous], levels))))
+        
+        for index in changes:
+            device_time = self.acquisition_start + (self.sample_count + index) / self.sample_rate
+            self.pending_edges.append((device_time, bool(levels[index])))
+        
+        self.last_state = bool(levels[-1])
+        self.sample_count += len(levels)
+
+    def read_edges(self):
+        """Read edges since the last call as (device_time, state) pairs
+
+        device_time is None when no sample-clock acquisition is running and
+        the pin is polled instead.
+        """
+        if not self.is_reading:
+            return []
+            
+        if self.acquisition_running:
+            try:
+                self._fetch_samples()
+            except Exception as e:
+                print(f"Error reading samples, using host timestamps: {e}")
+                self.acquisition_running = False
+            edges, self.pending_edges = self.pending_edges, []
+            return edges
+            
+        # No sample clock - poll the pin, the caller timestamps the edge
+        if self.check_toggle():
+            return [(None, self.last_state)]
+        return []
+
+    def read_device_time(self):
+        """Device time of the newest acquired sample, or None without an acquisition"""
+        if not self.acquisition_running:
+            return None
+        try:
+            self._fetch_samples()
+        except Exception as e:
+            print(f"Error reading samples, using host timestamps: {e}")
+            self.acquisition_running = False
+            return None
+        if self.acquisition_start is None:
+            return None  # A new record is not anchored yet
+        return self.acquisition_start + self.sample_count / self.sample_rate
+
     def get_pin_state(self):
         """Get the current state of the DIO pin"""
         return self._read_pin_state()
\ No newline at end of file
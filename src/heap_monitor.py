@@ -1,13 +1,79 @@
 import psutil
 import time
-from utils import log_event
+import tracemalloc
+from utils import log_event, get_console_mode
+
+class MemorySpikeDetector:
+    """Streaming change-point detector for RSS samples.
+
+    The baseline is the mean of the first ``warmup_samples`` samples and then
+    follows RSS as a slow EWMA. Positive deviations from the baseline are
+    accumulated in a one-sided CUSUM; deviations smaller than ``slack_mb``
+    are treated as noise, and once the accumulated excess passes
+    ``cusum_threshold_mb`` a change point is reported. The baseline is frozen
+    while the CUSUM is above zero, so a slow leak cannot drag the baseline
+    along with it and is caught even when no single step is large.
+    """
+
+    def __init__(self, alpha=0.001, slack_mb=1.0, cusum_threshold_mb=20.0, warmup_samples=30):
+        self.alpha = alpha
+        self.slack = slack_mb * 1024 * 1024
+        self.cusum_threshold = cusum_threshold_mb * 1024 * 1024
+        self.warmup_samples = warmup_samples
+        self.reset()
+
+    def reset(self):
+        """Forget the baseline and accumulated deviation"""
+        self.baseline = None
+        self.cusum = 0.0
+        self.samples_seen = 0
+
+    def update(self, rss):
+        """Feed one RSS sample, returns the accumulated excess in MB on a change point, else None"""
+        self.samples_seen += 1
+        
+        if self.samples_seen <= self.warmup_samples or self.baseline is None:
+            # Average the warmup samples into the initial baseline
+            if self.baseline is None:
+                self.baseline = float(rss)
+            else:
+                self.baseline += (rss - self.baseline) / self.samples_seen
+            return None
+            
+        self.cusum = max(0.0, self.cusum + (rss - self.baseline) - self.slack)
+        
+        if self.cusum == 0.0:
+            # Only adapt while in control, never towards a rise being tracked
+            self.baseline += self.alpha * (rss - self.baseline)
+            return None
+        
+        if self.cusum > self.cusum_threshold:
+            excess_mb = self.cusum / (1024 * 1024)
+            # Restart from the new level so one change is reported once
+            self.baseline = float(rss)
+            self.cusum = 0.0
+            return excess_mb
+        return None
 
 class HeapMonitor:
-    def __init__(self):
+    def __init__(self, trace_allocations=False, clock=time.time):
         self.heap_sizes = []
+        self.clock = clock  # Timestamp source, shared with edge timestamps
         self.process = psutil.Process()
         self.last_log_time = 0
         self.log_interval = 1.0  # Log every 1 second to avoid spam
+        
+        # Spike detection state - only samples after this index are unchecked
+        self.spike_detector = MemorySpikeDetector()
+        self.checked_samples = 0
+        
+        # Optional allocation attribution for the monitoring process itself
+        self.trace_allocations = trace_allocations
+        self.allocation_snapshot = None
+        if trace_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self.allocation_snapshot = tracemalloc.take_snapshot()
 
     def get_memory_info(self):
         """Get detailed memory information"""
@@ -32,45 +98,88 @@ class HeapMonitor:
         return 0
 
     def log_heap_size(self):
-        """Log heap size with rate limiting"""
-        current_time = time.time()
+        """Log heap size with rate limiting
+
+        Returns the new sample, or None if no sample was taken.
+        """
+        current_time = self.clock()
         
         # Rate limit logging to avoid spam
         if current_time - self.last_log_time < self.log_interval:
-            return
+            return None
             
         current_size = self.check_heap_size()
         memory_info = self.get_memory_info()
         
         if memory_info:
-            self.heap_sizes.append({
+            sample = {
                 'timestamp': current_time,
                 'rss': memory_info['rss'],
                 'vms': memory_info['vms'],
                 'percent': memory_info['percent']
-            })
+            }
+            self.heap_sizes.append(sample)
             
-            # Log to console (less verbose)
-            print(f"Memory: RSS={memory_info['rss']//1024//1024}MB, "
-                  f"VMS={memory_info['vms']//1024//1024}MB, "
-                  f"Usage={memory_info['percent']:.1f}%")
+            # Log to console (less verbose), the status line shows it otherwise
+            if get_console_mode() == 'verbose':
+                print(f"Memory: RSS={memory_info['rss']//1024//1024}MB, "
+                      f"VMS={memory_info['vms']//1024//1024}MB, "
+                      f"Usage={memory_info['percent']:.1f}%")
             
             self.last_log_time = current_time
+            return sample
+        return None
 
     def check_memory_spike(self, threshold_mb=100):
-        """Check if there's been a significant memory increase"""
-        if len(self.heap_sizes) < 2:
+        """Check if there's been a significant memory increase
+
+        Only samples recorded since the previous call are evaluated. A spike
+        is either a step larger than threshold_mb between consecutive samples
+        or a sustained rise flagged by the change-point detector.
+        """
+        if self.checked_samples >= len(self.heap_sizes):
             return False
             
-        current = self.heap_sizes[-1]['rss']
-        previous = self.heap_sizes[-2]['rss']
+        spike = False
+        for index in range(self.checked_samples, len(self.heap_sizes)):
+            current = self.heap_sizes[index]['rss']
+            step = False
+            
+            if index > 0:
+                previous = self.heap_sizes[index - 1]['rss']
+                increase_mb = (current - previous) / (1024 * 1024)
+                if increase_mb > threshold_mb:
+                    log_event(f"Memory spike detected: +{increase_mb:.1f}MB")
+                    step = True
+            
+            excess_mb = self.spike_detector.update(current)
+            if excess_mb is not None and not step:
+                log_event(f"Memory change point detected: {excess_mb:.1f}MB above baseline")
+            
+            spike = spike or step or excess_mb is not None
         
-        increase_mb = (current - previous) / (1024 * 1024)
+        self.checked_samples = len(self.heap_sizes)
         
-        if increase_mb > threshold_mb:
-            log_event(f"Memory spike detected: +{increase_mb:.1f}MB")
-            return True
-        return False
+        if spike and self.trace_allocations:
+            self._log_allocation_growth()
+        return spike
+
+    def _log_allocation_growth(self, limit=10):
+        """Log the allocation sites that grew most since the last snapshot"""
+        try:
+            snapshot = tracemalloc.take_snapshot()
+            stats = snapshot.compare_to(self.allocation_snapshot, 'lineno')
+            self.allocation_snapshot = snapshot
+            
+            # compare_to sorts by absolute change, so freed sites can come first
+            grown = [stat for stat in stats if stat.size_diff > 0][:limit]
+            
+            log_event("   Top allocation growth since last check:")
+            for stat in grown:
+                log_event(f"   {stat.traceback} +{stat.size_diff/1024:.1f}KB "
+                          f"({stat.count_diff:+d} blocks)")
+        except Exception as e:
+            print(f"Error taking allocation snapshot: {e}")
 
     def get_heap_sizes(self):
         """Get all recorded heap sizes"""
@@ -79,6 +188,8 @@ class HeapMonitor:
     def clear_heap_sizes(self):
         """Clear recorded heap sizes"""
         self.heap_sizes.clear()
+        self.checked_samples = 0
+        self.spike_detector.reset()
 
     def get_memory_summary(self):
         """Get a summary of memory usage"""
@@ -3,12 +3,29 @@ import signal
 import sys
 from dio_reader import DIOReader
 from heap_monitor import HeapMonitor
-from utils import log_event, analyze_toggle_pattern, clear_log_file
+from capture import CaptureBuffer, clear_capture_file
+from clock_sync import ClockAligner
+from utils import log_event, analyze_toggle_pattern, clear_log_file, set_console_mode, StatusLine
 
 class DIOAnalyzer:
-    def __init__(self, pin=0, rapid_toggle_count=6, rapid_window_ms=60):
+    def __init__(self, pin=0, rapid_toggle_count=6, rapid_window_ms=60,
+                 capture_file=None, pre_trigger_ms=500, post_trigger_ms=500,
+                 trace_allocations=False, console_mode='verbose', status_refresh_hz=4):
         self.dio_reader = DIOReader(pin=pin)
-        self.heap_monitor = HeapMonitor()
+        
+        # Edges are timestamped on the device clock and mapped to host time;
+        # memory samples use the same host timescale so the two correlate
+        self.clock_aligner = ClockAligner(sync_interval=1.0)
+        self.heap_monitor = HeapMonitor(trace_allocations=trace_allocations,
+                                        clock=self.clock_aligner.host_time)
+        
+        # Windowed capture - only the surroundings of detected events are
+        # persisted, instead of logging every toggle
+        self.capture = None
+        if capture_file:
+            self.capture = CaptureBuffer(capture_file=capture_file,
+                                         pre_trigger_ms=pre_trigger_ms,
+                                         post_trigger_ms=post_trigger_ms)
         
         # Configuration
         self.rapid_toggle_count = rapid_toggle_count
@@ -18,6 +35,7 @@ class DIOAnalyzer:
         self.toggle_count = 0
         self.toggle_times = []
         self.last_toggle_time = 0
+        self.last_edge_device_time = None
         self.running = False
         self.total_toggles = 0
         
@@ -25,6 +43,14 @@ class DIOAnalyzer:
         self.rapid_sequences_detected = 0
         self.start_time = None
         
+        # Console output - in status mode a single refreshed line replaces
+        # per-event prints, full detail still goes to the log file
+        self.console_mode = console_mode
+        self.status_line = StatusLine(refresh_hz=status_refresh_hz) if console_mode == 'status' else None
+        self.last_status_time = None
+        self.last_status_toggles = 0
+        self.last_detection = None
+        
     def signal_handler(self, signum, frame):
         """Handle Ctrl+C gracefully"""
         log_event("Interrupt signal received. Shutting down...")
@@ -33,16 +59,24 @@ class DIOAnalyzer:
     def start(self):
         """Start the monitoring process"""
         self.running = True
-        self.start_time = time.time()
+        self.start_time = self.clock_aligner.host_time()
         
         # Set up signal handler for graceful shutdown
         signal.signal(signal.SIGINT, self.signal_handler)
         
         log_event("Starting DIO analysis...")
         log_event(f"Configuration: {self.rapid_toggle_count} toggles within {self.rapid_window_ms*1000}ms")
+        if self.capture:
+            # Each run starts a fresh capture file, batch treats a file as one run
+            clear_capture_file(self.capture.capture_file)
+            log_event(f"Capture mode: {self.capture.pre_trigger*1000:.0f}ms pre-trigger, "
+                      f"{self.capture.post_trigger*1000:.0f}ms post-trigger -> {self.capture.capture_file}")
+        
+        set_console_mode(self.console_mode)
         
         try:
             self.dio_reader.start_reading()
+            self.clock_aligner.sync(self.dio_reader.read_device_time)
             self._monitoring_loop()
         except Exception as e:
             log_event(f"Error during monitoring: {e}")
@@ -55,8 +89,19 @@ class DIOAnalyzer:
             return
             
         self.running = False
+        
+        # Leave the status line before anything else prints; final
+        # statistics go back to the console in full
+        if self.status_line:
+            self.status_line.finish()
+        set_console_mode('verbose')
+        
         self.dio_reader.stop_reading()
         
+        if self.capture:
+            # Keep the whole run's memory timeline, not just the trigger windows
+            self.capture.close(memory_samples=self.heap_monitor.get_heap_sizes())
+        
         # Print final statistics
         self._print_final_stats()
         
@@ -66,29 +111,59 @@ class DIOAnalyzer:
     def _monitoring_loop(self):
         """Main monitoring loop"""
         while self.running:
-            current_time = time.time()
+            current_time = self.clock_aligner.host_time()
             
-            # Check for DIO toggle
-            if self.dio_reader.check_toggle():
-                self._handle_toggle(current_time)
+            # Periodically refresh the device/host clock alignment
+            if self.clock_aligner.needs_sync():
+                self.clock_aligner.sync(self.dio_reader.read_device_time)
+            
+            # Check for DIO toggles, timestamped on the device sample clock
+            for device_time, state in self.dio_reader.read_edges():
+                self._handle_toggle(self._edge_time(device_time, current_time), state)
             
             # Monitor memory (with built-in rate limiting)
-            self.heap_monitor.log_heap_size()
+            sample = self.heap_monitor.log_heap_size()
+            if sample and self.capture:
+                self.capture.record_memory(sample)
             
             # Check for memory spikes
             if self.heap_monitor.check_memory_spike(threshold_mb=50):
                 log_event("Memory spike detected during DIO monitoring")
+                self.last_detection = ('Memory spike', current_time)
+                if self.capture:
+                    self.capture.trigger(current_time, 'memory_spike')
+            
+            # Persist capture windows whose post-trigger period has elapsed
+            if self.capture:
+                self.capture.poll(current_time)
+            
+            if self.status_line:
+                self.status_line.update(current_time, lambda: self._format_status(current_time))
             
             # Small sleep to prevent excessive CPU usage
             time.sleep(0.001)  # 1ms sleep
     
-    def _handle_toggle(self, current_time):
+    def _edge_time(self, device_time, fallback_time):
+        """Host timestamp of a toggle, derived from the device clock when possible"""
+        if device_time is None or not self.clock_aligner.is_synced():
+            return fallback_time
+        # A device time that does not advance means a stale clock
+        if self.last_edge_device_time is not None and device_time <= self.last_edge_device_time:
+            return fallback_time
+        self.last_edge_device_time = device_time
+        return self.clock_aligner.to_host_time(device_time)
+    
+    def _handle_toggle(self, current_time, state=None):
         """Handle a detected toggle"""
         self.toggle_count += 1
         self.total_toggles += 1
         self.toggle_times.append(current_time)
         
-        log_event(f"Toggle #{self.total_toggles} detected at {current_time:.6f}")
+        if self.capture:
+            # Edges stay in memory until a trigger persists their window
+            self.capture.record_edge(current_time, state)
+        else:
+            log_event(f"Toggle #{self.total_toggles} detected at {current_time:.6f}")
         
         # Set the first toggle time for sequence detection
         if self.toggle_count == 1:
@@ -104,6 +179,10 @@ class DIOAnalyzer:
         
         if time_diff <= self.rapid_window_ms:
             self.rapid_sequences_detected += 1
+            self.last_detection = (f"Rapid #{self.rapid_sequences_detected}", current_time)
+            
+            if self.capture:
+                self.capture.trigger(current_time, 'rapid_sequence')
             
             # Analyze the toggle pattern
             recent_toggles = self.toggle_times[-self.rapid_toggle_count:]
@@ -125,10 +204,31 @@ class DIOAnalyzer:
         self.toggle_count = 0
         self.toggle_times = self.toggle_times[-self.rapid_toggle_count:]  # Keep last N toggles
     
+    def _format_status(self, current_time):
+        """Build the status line text"""
+        if self.last_status_time is None:
+            self.last_status_time = self.start_time
+        elapsed = current_time - self.last_status_time
+        rate = (self.total_toggles - self.last_status_toggles) / elapsed if elapsed > 0 else 0
+        self.last_status_time = current_time
+        self.last_status_toggles = self.total_toggles
+        
+        status = (f"Toggles: {self.total_toggles} ({rate:.1f}/s) | "
+                  f"Rapid: {self.rapid_sequences_detected}")
+        
+        if self.last_detection:
+            name, detected_at = self.last_detection
+            status += f" | Last: {name} {current_time - detected_at:.1f}s ago"
+        
+        heap_sizes = self.heap_monitor.heap_sizes
+        if heap_sizes:
+            status += f" | RSS: {heap_sizes[-1]['rss']//1024//1024}MB"
+        return status
+    
     def _print_final_stats(self):
         """Print final statistics"""
         if self.start_time:
-            runtime = time.time() - self.start_time
+            runtime = self.clock_aligner.host_time() - self.start_time
             log_event("="*50)
             log_event("FINAL STATISTICS")
             log_event("="*50)
@@ -136,9 +236,20 @@ class DIOAnalyzer:
             log_event(f"Total toggles detected: {self.total_toggles}")
             log_event(f"Rapid sequences detected: {self.rapid_sequences_detected}")
             
+            if self.capture:
+                capture_stats = self.capture.get_stats()
+                log_event(f"Capture windows written: {capture_stats['windows_written']} "
+                          f"({capture_stats['edges_written']} edges)")
+            
             if runtime > 0:
                 log_event(f"Average toggle rate: {self.total_toggles/runtime:.2f} toggles/sec")
             
+            alignment = self.clock_aligner.get_alignment()
+            if alignment:
+                log_event(f"Device clock drift: {alignment['drift_ppm']:.2f} ppm "
+                          f"({alignment['sync_points']} sync points, "
+                          f"{alignment['rejected_points']} rejected)")
+            
             # Memory summary
             memory_summary = self.heap_monitor.get_memory_summary()
             if memory_summary != "No memory data available":
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Run report generator
+
+Renders edge-rate, interval histogram and RSS timelines from a capture file
+to PNG (matplotlib) and/or HTML (plotly). Long series are decimated before
+plotting so multi-million edge runs render quickly into small files.
+"""
+
+import argparse
+import sys
+import numpy as np
+from capture import load_capture, load_memory_samples
+
+try:
+    import matplotlib
+    matplotlib.use('Agg')  # Render without a display
+    import matplotlib.pyplot as plt
+    MATPLOTLIB_AVAILABLE = True
+except ImportError:
+    print("Warning: matplotlib not available. Install with: pip install matplotlib")
+    MATPLOTLIB_AVAILABLE = False
+
+try:
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    PLOTLY_AVAILABLE = True
+except ImportError:
+    print("Warning: plotly not available. Install with: pip install plotly")
+    PLOTLY_AVAILABLE = False
+
+def load_run(capture_file):
+    """Load edges, memory samples and triggers of a run as numpy arrays
+
+    Edges only cover the trigger windows; memory samples cover the whole run
+    when the analyzer wrote its memory history on close.
+    """
+    windows = load_capture(capture_file)
+    # Windows are written in order, but sort in case files were concatenated
+    windows.sort(key=lambda window: window['start'])
+
+    edge_times = np.fromiter((edge[0] for window in windows for edge in window['edges']),
+                             dtype=float)
+    # Index into edge_times where each window's edges begin
+    window_counts = [len(window['edges']) for window in windows]
+    window_splits = np.cumsum([0] + window_counts[:-1]).astype(np.int64)
+    memory = load_memory_samples(capture_file)
+    triggers = [trigger for window in windows for trigger in window['triggers']]
+
+    return {
+        'edge_times': edge_times,
+        'window_splits': window_splits,
+        'window_bounds': np.array([[window['start'], window['end']] for window in windows],
+                                  dtype=float).reshape(-1, 2),
+        'memory_times': np.array([sample['timestamp'] for sample in memory], dtype=float),
+        'rss_mb': np.array([sample['rss'] for sample in memory], dtype=float) / (1024 * 1024),
+        'rapid_times': np.array([t['timestamp'] for t in triggers
+                                 if t['reason'] == 'rapid_sequence'], dtype=float),
+        'spike_times': np.array([t['timestamp'] for t in triggers
+                                 if t['reason'] == 'memory_spike'], dtype=float)
+    }
+
+def minmax_decimate(x, y, n_buckets):
+    """Keep the minimum and maximum of each bucket so peaks survive decimation
+
+    Returns at most 3 * n_buckets points: a bucket containing a window break
+    also keeps one NaN.
+    """
+    n = len(x)
+    if n <= 2 * n_buckets:
+        return x, y
+
+    bounds = np.linspace(0, n, n_buckets + 1).astype(int)
+    indices = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        bucket = y[start:end]
+        gaps = np.isnan(bucket)
+        if gaps.all():
+            indices.append(start)
+            continue
+
+        picks = {start + int(np.argmin(np.where(gaps, np.inf, bucket))),
+                 start + int(np.argmax(np.where(gaps, -np.inf, bucket)))}
+        if gaps.any():
+            # Keep one NaN so the break between capture windows survives
+            picks.add(start + int(np.argmax(gaps)))
+        indices.extend(sorted(picks))
+
+    indices = np.array(indices)
+    return x[indices], y[indices]
+
+def lttb_decimate(x, y, n_out):
+    """Largest-Triangle-Three-Buckets downsampling to n_out points"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    # First and last points are always kept, the rest is split into buckets
+    bounds = np.linspace(1, n - 1, n_out - 1).astype(int)
+    indices = [0]
+    a = 0
+
+    for i in range(n_out - 2):
+        start, end = bounds[i], bounds[i + 1]
+        if i + 2 < len(bounds):
+            next_start, next_end = bounds[i + 1], bounds[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # Pick the point forming the largest triangle with the previous
+        # selected point and the average of the next bucket
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) -
+                       (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        indices.append(a)
+
+    indices.append(n - 1)
+    indices = np.array(indices)
+    return x[indices], y[indices]
+
+def edge_rate(edge_times, window_splits, window_bounds, bin_ms=10):
+    """Edges per second in fixed bins within each capture window
+
+    Returns (bin start times, rates). Uncaptured time between windows is a
+    single NaN point, so plots show a break instead of zero edges/s.
+    """
+    bin_s = bin_ms / 1000.0
+    splits = list(window_splits) + [len(edge_times)]
+    all_times = []
+    all_rates = []
+
+    for i, (start, end) in enumerate(window_bounds):
+        edges = edge_times[splits[i]:splits[i + 1]]
+        n_bins = max(1, int(np.ceil((end - start) / bin_s)))
+        bins = np.clip(((edges - start) / bin_s).astype(np.int64), 0, n_bins - 1)
+        counts = np.bincount(bins, minlength=n_bins)
+
+        if all_times:
+            all_times.append(np.array([start]))
+            all_rates.append(np.array([np.nan]))
+        all_times.append(start + np.arange(n_bins) * bin_s)
+        all_rates.append(counts / bin_s)
+
+    if not all_times:
+        return np.array([]), np.array([])
+    return np.concatenate(all_times), np.concatenate(all_rates)
+
+def interval_histogram(edge_times, window_splits, n_bins=100):
+    """Histogram of intervals between edges on log-spaced bins, in ms
+
+    Intervals spanning the gap between two capture windows are left out.
+    """
+    intervals = np.diff(edge_times) * 1000
+    boundaries = np.asarray(window_splits, dtype=np.int64)
+    boundaries = boundaries[(boundaries > 0) & (boundaries < len(edge_times))]
+    keep = np.ones(len(intervals), dtype=bool)
+    keep[boundaries - 1] = False
+    intervals = intervals[keep & (intervals > 0)]
+    if len(intervals) == 0:
+        return np.array([]), np.array([])
+
+    bins = np.logspace(np.log10(intervals.min()), np.log10(intervals.max()) + 1e-9, n_bins + 1)
+    counts, bins = np.histogram(intervals, bins=bins)
+    return bins, counts
+
+def prepare_series(run, max_points=2000, rate_bin_ms=10):
+    """Compute decimated plot series for a loaded run"""
+    rate_times, rates = edge_rate(run['edge_times'], run['window_splits'],
+                                  run['window_bounds'], rate_bin_ms)
+    # Each bucket keeps at most a minimum, a maximum and one window break
+    rate_times, rates = minmax_decimate(rate_times, rates, max_points // 3)
+
+    memory_times, rss_mb = lttb_decimate(run['memory_times'], run['rss_mb'], max_points)
+    interval_bins, interval_counts = interval_histogram(run['edge_times'], run['window_splits'])
+
+    return {
+        'rate_times': rate_times,
+        'rates': rates,
+        'interval_bins': interval_bins,
+        'interval_counts': interval_counts,
+        'memory_times': memory_times,
+        'rss_mb': rss_mb,
+        'rapid_times': run['rapid_times'],
+        'spike_times': run['spike_times']
+    }
+
+def render_png(series, output_file):
+    """Render the report as a PNG image with matplotlib"""
+    fig, (rate_ax, interval_ax, memory_ax) = plt.subplots(3, 1, figsize=(12, 10))
+
+    rate_ax.plot(series['rate_times'], series['rates'], linewidth=0.8)
+    if len(series['rapid_times']):
+        rate_ax.vlines(series['rapid_times'], 0, 1, transform=rate_ax.get_xaxis_transform(),
+                       colors='red', linewidth=0.5, label='Rapid sequence')
+        rate_ax.legend(loc='upper right')
+    rate_ax.set_title('Edge rate')
+    rate_ax.set_xlabel('Time (s)')
+    rate_ax.set_ylabel('Edges/s')
+
+    if len(series['interval_counts']):
+        interval_ax.stairs(series['interval_counts'], series['interval_bins'], fill=True)
+        interval_ax.set_xscale('log')
+    interval_ax.set_title('Edge interval histogram')
+    interval_ax.set_xlabel('Interval (ms)')
+    interval_ax.set_ylabel('Count')
+
+    memory_ax.plot(series['memory_times'], series['rss_mb'], linewidth=0.8)
+    if len(series['spike_times']):
+        memory_ax.vlines(series['spike_times'], 0, 1, transform=memory_ax.get_xaxis_transform(),
+                         colors='orange', linewidth=0.5, label='Memory spike')
+        memory_ax.legend(loc='upper right')
+    memory_ax.set_title('Memory (RSS)')
+    memory_ax.set_xlabel('Time (s)')
+    memory_ax.set_ylabel('RSS (MB)')
+
+    fig.tight_layout()
+    fig.savefig(output_file, dpi=100)
+    plt.close(fig)
+
+def render_html(series, output_file):
+    """Render the report as an interactive HTML page with plotly"""
+    fig = make_subplots(rows=3, cols=1, subplot_titles=(
+        'Edge rate', 'Edge interval histogram', 'Memory (RSS)'))
+
+    fig.add_trace(go.Scattergl(x=series['rate_times'], y=series['rates'],
+                               mode='lines', name='Edges/s'), row=1, col=1)
+    if len(series['rapid_times']):
+        fig.add_trace(go.Scattergl(x=series['rapid_times'], y=np.zeros(len(series['rapid_times'])),
+                                   mode='markers', marker=dict(color='red', symbol='triangle-up'),
+                                   name='Rapid sequence'), row=1, col=1)
+
+    if len(series['interval_counts']):
+        centers = np.sqrt(series['interval_bins'][:-1] * series['interval_bins'][1:])
+        fig.add_trace(go.Bar(x=centers, y=series['interval_counts'], name='Intervals'), row=2, col=1)
+        fig.update_xaxes(type='log', title_text='Interval (ms)', row=2, col=1)
+
+    fig.add_trace(go.Scattergl(x=series['memory_times'], y=series['rss_mb'],
+                               mode='lines', name='RSS (MB)'), row=3, col=1)
+    if len(series['spike_times']):
+        fig.add_trace(go.Scattergl(x=series['spike_times'], y=np.zeros(len(series['spike_times'])),
+                                   mode='markers', marker=dict(color='orange', symbol='triangle-up'),
+                                   name='Memory spike'), row=3, col=1)
+
+    fig.update_layout(height=900, title_text='DIO run report')
+    # Load plotly.js from the CDN to keep the report small
+    fig.write_html(output_file, include_plotlyjs='cdn')
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Render a report for a recorded DIO run')
+    parser.add_argument('capture_file', help='Capture file written by the analyzer')
+    parser.add_argument('--png', help='Write a PNG report to this file')
+    parser.add_argument('--html', help='Write an HTML report to this file')
+    parser.add_argument('--max-points', type=int, default=2000,
+                        help='Maximum points per timeline after decimation')
+    parser.add_argument('--rate-bin-ms', type=float, default=10,
+                        help='Bin width for the edge-rate timeline')
+    args = parser.parse_args()
+
+    if not args.png and not args.html:
+        parser.error('at least one of --png or --html is required')
+
+    run = load_run(args.capture_file)
+    print(f"Loaded {len(run['edge_times'])} edges and {len(run['memory_times'])} memory samples")
+    series = prepare_series(run, max_points=args.max_points, rate_bin_ms=args.rate_bin_ms)
+
+    if args.png:
+        if not MATPLOTLIB_AVAILABLE:
+            print("❌ matplotlib is required for PNG reports")
+            sys.exit(1)
+        render_png(series, args.png)
+        print(f"✅ PNG report written to {args.png}")
+
+    if args.html:
+        if not PLOTLY_AVAILABLE:
+            print("❌ plotly is required for HTML reports")
+            sys.exit(1)
+        render_html(series, args.html)
+        print(f"✅ HTML report written to {args.html}")
+
+if __name__ == "__main__":
+    main()
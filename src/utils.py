@@ -1,7 +1,24 @@
 import time
 import os
+import sys
 from datetime import datetime
 
+# Console output mode: 'verbose' prints every logged event, 'status' leaves
+# the detail to the log file and shows a single refreshed StatusLine instead
+CONSOLE_MODES = ('verbose', 'status')
+_console_mode = 'verbose'
+
+def set_console_mode(mode):
+    """Set the console output mode ('verbose' or 'status')"""
+    global _console_mode
+    if mode not in CONSOLE_MODES:
+        raise ValueError(f"Unknown console mode: {mode}")
+    _console_mode = mode
+
+def get_console_mode():
+    """Get the current console output mode"""
+    return _console_mode
+
 def format_time(timestamp):
     """Format timestamp to readable string"""
     return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
@@ -12,8 +29,9 @@ def log_event(message, log_file='event_log.txt'):
     formatted_time = format_time(timestamp)
     log_message = f"[{formatted_time}] {message}"
     
-    # Print to console
-    print(log_message)
+    # Print to console (status mode only writes the log file)
+    if _console_mode == 'verbose':
+        print(log_message)
     
     # Write to log file
     try:
@@ -27,6 +45,41 @@ def log_event(message, log_file='event_log.txt'):
     except Exception as e:
         print(f"Error writing to log file: {e}")
 
+class StatusLine:
+    """Single console line refreshed at a fixed rate
+
+    The status text is only rendered when a refresh is due, so the cost of
+    console output does not depend on how often update() is called.
+    """
+
+    def __init__(self, refresh_hz=4, stream=None):
+        self.refresh_interval = 1.0 / refresh_hz
+        self.stream = stream if stream is not None else sys.stdout
+        self.last_refresh = 0
+        self.last_length = 0
+
+    def update(self, current_time, render):
+        """Redraw the line with render() if a refresh is due"""
+        if current_time - self.last_refresh < self.refresh_interval:
+            return False
+
+        text = render()
+        # Pad with spaces to overwrite a longer previous line
+        padding = ' ' * max(0, self.last_length - len(text))
+        self.stream.write('\r' + text + padding)
+        self.stream.flush()
+
+        self.last_length = len(text)
+        self.last_refresh = current_time
+        return True
+
+    def finish(self):
+        """Move off the status line so following output starts on a new line"""
+        if self.last_length:
+            self.stream.write('\n')
+            self.stream.flush()
+            self.last_length = 0
+
 def calculate_frequency(toggle_times):
     """Calculate frequency from toggle times"""
     if len(toggle_times) < 2:
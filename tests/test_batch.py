@@ -0,0 +1,93 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.batch import run_batch, analyze_capture_file
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.temp_dir.name, 'cache.json')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_capture(self, name, windows):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            for edge_times, reasons in windows:
+                window = {
+                    'start': edge_times[0],
+                    'end': edge_times[-1],
+                    'triggers': [{'timestamp': edge_times[-1], 'reason': reason}
+                                 for reason in reasons],
+                    'edges': [[t, None] for t in edge_times],
+                    'memory': [{'timestamp': edge_times[0], 'rss': 50 * 1024 * 1024}]
+                }
+                f.write(json.dumps(window) + '\n')
+        return path
+
+    def test_only_new_files_are_processed(self):
+        self.write_capture('run1.jsonl', [([i / 100 for i in range(6)], ['rapid_sequence'])])
+
+        rows, processed = run_batch([self.temp_dir.name], cache_file=self.cache_file, jobs=2)
+        self.assertEqual(processed, 1)
+        self.assertEqual(rows[0]['rapid_sequences'], 1)
+        self.assertAlmostEqual(rows[0]['avg_interval'], 10.0)
+        self.assertAlmostEqual(rows[0]['max_mb'], 50.0)
+
+        self.write_capture('run2.jsonl', [([i / 10 for i in range(6)], [])])
+
+        rows, processed = run_batch([self.temp_dir.name], cache_file=self.cache_file, jobs=2)
+        self.assertEqual(processed, 1)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1]['rapid_sequences'], 0)
+
+    def test_analysis_version_change_reprocesses(self):
+        self.write_capture('run1.jsonl', [([i / 100 for i in range(6)], [])])
+
+        _, processed = run_batch([self.temp_dir.name], cache_file=self.cache_file, jobs=1)
+        self.assertEqual(processed, 1)
+        _, processed = run_batch([self.temp_dir.name], cache_file=self.cache_file, jobs=1)
+        self.assertEqual(processed, 0)
+
+        with patch('src.batch.ANALYSIS_VERSION', 'next'):
+            _, processed = run_batch([self.temp_dir.name], cache_file=self.cache_file, jobs=1)
+        self.assertEqual(processed, 1)
+
+    def test_memory_history_of_whole_run(self):
+        path = self.write_capture('run.jsonl', [([i / 100 for i in range(6)], [])])
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'type': 'memory', 'samples': [
+                {'timestamp': t, 'rss': (40 + t) * 1024 * 1024} for t in range(21)]}) + '\n')
+
+        row = analyze_capture_file(path)
+        self.assertEqual(row['samples'], 21)
+        self.assertAlmostEqual(row['min_mb'], 40.0)
+        self.assertAlmostEqual(row['max_mb'], 60.0)
+
+    def test_rapid_sequence_after_pre_trigger_edges(self):
+        # 500ms of slow pre-trigger edges, then a 6-edge burst 1ms apart
+        slow = [i * 0.1 for i in range(5)]
+        burst = [0.5 + i * 0.001 for i in range(6)]
+        path = self.write_capture('run.jsonl', [(slow + burst, ['rapid_sequence'])])
+
+        row = analyze_capture_file(path)
+        self.assertEqual(row['rapid_sequences'], 1)
+
+    def test_gaps_between_windows_are_excluded(self):
+        # Two one-second windows an hour apart, edges every 100ms
+        first = [i / 10 for i in range(11)]
+        second = [3600 + i / 10 for i in range(11)]
+        path = self.write_capture('run.jsonl', [(first, ['memory_spike']), (second, [])])
+
+        row = analyze_capture_file(path)
+        self.assertEqual(row['edges'], 22)
+        self.assertAlmostEqual(row['duration_s'], 2.0)
+        self.assertAlmostEqual(row['max_interval'], 100.0)
+        self.assertAlmostEqual(row['frequency'], 10.0)
+        self.assertEqual(row['memory_spikes'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import os
+import tempfile
+import unittest
+from src.capture import CaptureBuffer, load_capture, load_memory_samples, clear_capture_file
+
+class TestCaptureBuffer(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.capture_file = os.path.join(self.temp_dir.name, 'capture.jsonl')
+        self.capture = CaptureBuffer(capture_file=self.capture_file,
+                                     pre_trigger_ms=100, post_trigger_ms=100)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_window_around_trigger(self):
+        # Edges every 50ms from 0.0s to 1.0s
+        for i in range(21):
+            self.capture.record_edge(i / 20, i % 2 == 0)
+
+        self.capture.trigger(0.5, 'rapid_sequence')
+        self.capture.poll(0.55)  # Post-trigger period not yet over
+        self.assertFalse(os.path.exists(self.capture_file))
+
+        self.capture.poll(0.7)
+        windows = load_capture(self.capture_file)
+
+        self.assertEqual(len(windows), 1)
+        edge_times = [t for t, _ in windows[0]['edges']]
+        self.assertEqual(len(edge_times), 5)  # 0.40 .. 0.60
+        self.assertTrue(all(0.4 - 1e-9 <= t <= 0.6 + 1e-9 for t in edge_times))
+
+    def test_overlapping_triggers_are_merged(self):
+        for i in range(21):
+            self.capture.record_edge(i / 20)
+        self.capture.record_memory({'timestamp': 0.55, 'rss': 1024})
+
+        self.capture.trigger(0.4, 'rapid_sequence')
+        self.capture.trigger(0.55, 'memory_spike')
+        self.capture.close()
+
+        windows = load_capture(self.capture_file)
+        self.assertEqual(len(windows), 1)
+        self.assertEqual(len(windows[0]['triggers']), 2)
+        self.assertAlmostEqual(windows[0]['end'], 0.65)
+        self.assertEqual(len(windows[0]['memory']), 1)
+
+    def test_separate_triggers_do_not_duplicate_edges(self):
+        for i in range(41):
+            self.capture.record_edge(i / 20)
+
+        self.capture.trigger(0.5, 'rapid_sequence')
+        self.capture.trigger(1.5, 'rapid_sequence')
+        self.capture.close()
+
+        windows = load_capture(self.capture_file)
+        self.assertEqual(len(windows), 2)
+        edge_times = [t for w in windows for t, _ in w['edges']]
+        self.assertEqual(len(edge_times), len(set(edge_times)))
+
+    def test_edge_on_window_boundary_written_once(self):
+        for i in range(21):
+            self.capture.record_edge(i / 20)
+
+        # First window ends at 0.6, the second would start at 0.55 and is
+        # clamped to 0.6 - the edge at exactly 0.6 belongs to the first one
+        self.capture.trigger(0.5, 'rapid_sequence')
+        self.capture.poll(0.61)
+        self.capture.trigger(0.65, 'rapid_sequence')
+        self.capture.close()
+
+        windows = load_capture(self.capture_file)
+        self.assertEqual(len(windows), 2)
+        self.assertEqual(windows[1]['start'], windows[0]['end'])
+        edge_times = [t for w in windows for t, _ in w['edges']]
+        self.assertEqual(edge_times.count(0.6), 1)
+        self.assertEqual(len(edge_times), len(set(edge_times)))
+
+    def test_continuous_triggers_are_split(self):
+        capture = CaptureBuffer(capture_file=self.capture_file, pre_trigger_ms=100,
+                                post_trigger_ms=100, max_window_ms=1000)
+
+        # A trigger every 50ms keeps extending the window
+        for i in range(100):
+            t = i / 20
+            capture.record_edge(t)
+            capture.trigger(t, 'rapid_sequence')
+            capture.poll(t)
+        capture.close()
+
+        windows = load_capture(self.capture_file)
+        self.assertGreater(len(windows), 1)
+        self.assertEqual(sum(len(w['edges']) for w in windows), 100)
+
+    def test_trigger_in_persisted_time_joins_last_window(self):
+        for i in range(21):
+            self.capture.record_edge(i / 20)
+
+        self.capture.trigger(0.5, 'rapid_sequence')
+        self.capture.poll(0.7)
+        # Its whole window (0.2 - 0.4) is clamped past persisted_until
+        self.capture.trigger(0.3, 'memory_spike')
+        self.capture.close()
+
+        windows = load_capture(self.capture_file)
+        self.assertEqual(len(windows), 1)
+        self.assertTrue(all(w['start'] < w['end'] for w in windows))
+        self.assertEqual([t['reason'] for t in windows[0]['triggers']],
+                         ['rapid_sequence', 'memory_spike'])
+        self.assertEqual(len(windows[0]['edges']), 5)
+
+    def test_clear_capture_file(self):
+        self.capture.trigger(0.5, 'rapid_sequence')
+        self.capture.close()
+        self.assertTrue(os.path.exists(self.capture_file))
+
+        clear_capture_file(self.capture_file)
+        self.assertFalse(os.path.exists(self.capture_file))
+
+    def test_memory_history_written_on_close(self):
+        self.capture.record_memory({'timestamp': 0.5, 'rss': 1024})
+        self.capture.trigger(0.5, 'rapid_sequence')
+        history = [{'timestamp': float(t), 'rss': 1024 * t} for t in range(10)]
+        self.capture.close(memory_samples=history)
+
+        # Windows are unaffected, memory covers the whole run
+        windows = load_capture(self.capture_file)
+        self.assertEqual(len(windows), 1)
+        self.assertEqual(len(windows[0]['memory']), 1)
+        self.assertEqual(load_memory_samples(self.capture_file), history)
+
+    def test_memory_samples_fall_back_to_windows(self):
+        self.capture.record_memory({'timestamp': 0.5, 'rss': 1024})
+        self.capture.trigger(0.5, 'rapid_sequence')
+        self.capture.close()
+
+        self.assertEqual(load_memory_samples(self.capture_file),
+                         [{'timestamp': 0.5, 'rss': 1024}])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from src.clock_sync import ClockAligner
+
+class TestClockAligner(unittest.TestCase):
+    def setUp(self):
+        self.aligner = ClockAligner()
+
+    def test_not_synced_initially(self):
+        self.assertFalse(self.aligner.is_synced())
+        self.assertTrue(self.aligner.needs_sync())
+        self.assertIsNone(self.aligner.get_alignment())
+
+    def test_offset_and_drift(self):
+        # Device clock runs 50ppm fast and started 1000s after the host clock
+        for i in range(10):
+            host = 5000.0 + i
+            device = (host - 1000.0) * (1 + 50e-6)
+            self.aligner.add_sync_point(device, host)
+
+        alignment = self.aligner.get_alignment()
+        self.assertAlmostEqual(alignment['drift_ppm'], -50.0, delta=0.01)
+
+        # An edge halfway between sync points maps back to host time
+        host = 5004.5
+        device = (host - 1000.0) * (1 + 50e-6)
+        self.assertAlmostEqual(self.aligner.to_monotonic(device), host, delta=1e-6)
+
+    def test_sync_ignores_missing_device_time(self):
+        self.assertFalse(self.aligner.sync(lambda: None))
+        self.assertFalse(self.aligner.is_synced())
+        self.assertFalse(self.aligner.needs_sync())
+
+    def test_stale_device_clock_is_rejected(self):
+        # A device clock that never advances must not map every edge to one time
+        self.aligner.add_sync_point(5.0, 100.0)
+        self.assertTrue(self.aligner.is_synced())
+
+        self.assertFalse(self.aligner.add_sync_point(5.0, 101.0))
+        self.assertFalse(self.aligner.add_sync_point(5.0, 102.0))
+
+        self.assertFalse(self.aligner.is_synced())
+        self.assertEqual(self.aligner.slope, 1.0)
+        self.assertEqual(self.aligner.get_alignment()['rejected_points'], 2)
+
+        # The clock recovers once it advances again
+        self.assertTrue(self.aligner.add_sync_point(8.0, 103.0))
+        self.assertTrue(self.aligner.is_synced())
+
+if __name__ == '__main__':
+    unittest.main()
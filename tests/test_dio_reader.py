@@ -1,6 +1,9 @@
 import time
 import unittest
-from unittest.mock import patch, MagicMock
+import numpy as np
+from unittest.mock import patch, MagicMock, create_autospec
+from pydwf import DwfAcquisitionMode, DwfState
+from pydwf.core.api.digital_in import DigitalIn
 from src.dio_reader import DIOReader
 
 class TestDIOReader(unittest.TestCase):
@@ -33,5 +36,52 @@ class TestDIOReader(unittest.TestCase):
         self.assertAlmostEqual(self.dio_reader.toggle_times[1] - self.dio_reader.toggle_times[0], 0.02, delta=0.005)
         self.assertAlmostEqual(self.dio_reader.toggle_times[2] - self.dio_reader.toggle_times[1], 0.02, delta=0.005)
 
+class TestSampleClockEdges(unittest.TestCase):
+    def setUp(self):
+        self.dio_reader = DIOReader(pin=1, sample_rate=1000)
+
+    def test_edges_from_sample_index(self):
+        # DigitalIn acquisition whose first status request is at device time 50.0s
+        device = MagicMock()
+        digital_in = device.digitalIn = create_autospec(DigitalIn, instance=True)
+        digital_in.internalClockInfo.return_value = 100e6
+        digital_in.triggerPositionInfo.return_value = 2 ** 30
+        digital_in.status.return_value = DwfState.Running
+        digital_in.statusTime.return_value = (50, 0, 1)
+        digital_in.statusRecord.side_effect = [(0, 0, 0), (6, 0, 0), (4, 10, 0)]
+        digital_in.statusData.side_effect = [
+            np.array([0, 0, 2, 2, 2, 0]),  # Pin 1 rises at sample 2, falls at 5
+            np.array([2, 2, 2, 2])         # Rises at 6 + 10 lost + 0 = 16
+        ]
+        self.dio_reader.device = device
+        self.dio_reader.is_reading = True
+        self.dio_reader.last_state = False
+
+        self.dio_reader._start_acquisition()
+        self.assertTrue(self.dio_reader.acquisition_running)
+        digital_in.dividerSet.assert_called_once_with(100000)
+        digital_in.acquisitionModeSet.assert_called_once_with(DwfAcquisitionMode.Record)
+
+        edges = self.dio_reader.read_edges() + self.dio_reader.read_edges()
+
+        self.assertEqual([state for _, state in edges], [True, False, True])
+        for (device_time, _), index in zip(edges, [2, 5, 16]):
+            self.assertAlmostEqual(device_time, 50.0 + index / 1000)
+        self.assertEqual(self.dio_reader.samples_lost, 10)
+
+    def test_simulated_edges_advance(self):
+        self.dio_reader.start_reading()
+        edges = []
+        for _ in range(200):
+            time.sleep(0.001)
+            edges.extend(self.dio_reader.read_edges())
+        device_now = self.dio_reader.read_device_time()
+        self.dio_reader.stop_reading()
+
+        device_times = [device_time for device_time, _ in edges]
+        self.assertTrue(edges)
+        self.assertTrue(all(t1 < t2 for t1, t2 in zip(device_times, device_times[1:])))
+        self.assertLessEqual(device_times[-1], device_now)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,7 +1,8 @@
 import time
+import tracemalloc
 import unittest
 from unittest.mock import patch
-from src.heap_monitor import HeapMonitor
+from src.heap_monitor import HeapMonitor, MemorySpikeDetector
 from src.dio_reader import DIOReader
 
 class TestHeapMonitor(unittest.TestCase):
@@ -37,5 +38,62 @@ class TestHeapMonitor(unittest.TestCase):
         for toggle_time, heap_size in zip(toggle_times, heap_sizes):
             print(f'Toggle at {toggle_time}, Heap size: {heap_size}')
 
+class TestMemorySpikeDetector(unittest.TestCase):
+    MB = 1024 * 1024
+
+    def test_flat_memory_does_not_fire(self):
+        detector = MemorySpikeDetector()
+        # Three hours of 1s samples with +/-300KB of noise
+        samples = [100 * self.MB + ((i * 7919) % 601 - 300) * 1024 for i in range(3 * 3600)]
+        self.assertTrue(all(detector.update(rss) is None for rss in samples))
+
+    def test_slow_leak_fires(self):
+        detector = MemorySpikeDetector()
+        # 1MB/min sampled every second, with +/-300KB of noise, for three hours
+        samples = [100 * self.MB + i * self.MB // 60 + ((i * 7919) % 601 - 300) * 1024
+                   for i in range(3 * 3600)]
+        fired = [i for i, rss in enumerate(samples) if detector.update(rss) is not None]
+
+        self.assertTrue(fired)
+        self.assertLess(fired[0], 10 * 60)  # Within ten minutes
+
+    def test_check_memory_spike_only_evaluates_new_samples(self):
+        heap_monitor = HeapMonitor()
+        heap_monitor.heap_sizes = [{'timestamp': 0, 'rss': 100 * self.MB},
+                                   {'timestamp': 1, 'rss': 200 * self.MB}]
+
+        self.assertTrue(heap_monitor.check_memory_spike(threshold_mb=50))
+        # No new samples - the same jump must not be reported again
+        self.assertFalse(heap_monitor.check_memory_spike(threshold_mb=50))
+
+class TestAllocationAttribution(unittest.TestCase):
+    MB = 1024 * 1024
+
+    def tearDown(self):
+        tracemalloc.stop()
+
+    @patch('src.heap_monitor.log_event')
+    def test_growth_logged_when_larger_site_freed(self, mock_log_event):
+        # Trace before allocating so the later free shows up in the diff
+        tracemalloc.start()
+        freed = bytearray(5 * self.MB)
+        heap_monitor = HeapMonitor(trace_allocations=True)
+
+        # The freed 5MB is the largest change, the growth must still be logged
+        del freed
+        grown = [bytes(1000) for _ in range(500)]
+
+        heap_monitor.heap_sizes = [{'timestamp': 0, 'rss': 100 * self.MB},
+                                   {'timestamp': 1, 'rss': 200 * self.MB}]
+        self.assertTrue(heap_monitor.check_memory_spike(threshold_mb=50))
+
+        messages = [call.args[0] for call in mock_log_event.call_args_list]
+        header = messages.index("   Top allocation growth since last check:")
+        growth = messages[header + 1:]
+        self.assertTrue(growth)
+        self.assertTrue(all('+' in message for message in growth))
+        self.assertTrue(any('test_heap_monitor.py' in message for message in growth))
+        self.assertEqual(len(grown), 500)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,83 @@
+import unittest
+import numpy as np
+from src.report import (minmax_decimate, lttb_decimate, edge_rate, interval_histogram,
+                        prepare_series)
+
+class TestReport(unittest.TestCase):
+
+    def test_minmax_decimate_keeps_peaks(self):
+        x = np.arange(100000, dtype=float)
+        y = np.zeros(100000)
+        y[12345] = 50.0  # Single spike must survive decimation
+        y[54321] = -20.0
+
+        dx, dy = minmax_decimate(x, y, 100)
+
+        self.assertLessEqual(len(dx), 200)
+        self.assertEqual(dy.max(), 50.0)
+        self.assertEqual(dy.min(), -20.0)
+        self.assertTrue(np.all(np.diff(dx) >= 0))
+
+    def test_lttb_decimate_keeps_endpoints(self):
+        x = np.linspace(0, 10, 10000)
+        y = np.sin(x)
+
+        dx, dy = lttb_decimate(x, y, 500)
+
+        self.assertEqual(len(dx), 500)
+        self.assertEqual(dx[0], x[0])
+        self.assertEqual(dx[-1], x[-1])
+        self.assertTrue(np.all(np.diff(dx) > 0))
+
+    def test_edge_rate(self):
+        # 100 edges 1ms apart, binned into 10ms bins
+        edge_times = 1000.0 + np.arange(100) * 0.001
+
+        times, rates = edge_rate(edge_times, [0], [[1000.0, 1000.1]], bin_ms=10)
+
+        self.assertAlmostEqual(rates.sum() * 0.01, 100)
+        self.assertAlmostEqual(rates.max(), 1000, delta=100)
+
+    def test_edge_rate_breaks_between_windows(self):
+        # Two one-second windows an hour apart
+        edge_times = np.concatenate([np.arange(10) * 0.1, 3600 + np.arange(10) * 0.1])
+        window_bounds = [[0.0, 1.0], [3600.0, 3601.0]]
+
+        times, rates = edge_rate(edge_times, [0, 10], window_bounds, bin_ms=100)
+
+        self.assertEqual(np.isnan(rates).sum(), 1)
+        self.assertEqual(len(rates), 21)  # 10 bins per window plus the break
+        self.assertAlmostEqual(np.nansum(rates) * 0.1, 20)
+
+        # The break survives decimation
+        _, decimated = minmax_decimate(times, rates, 5)
+        self.assertTrue(np.isnan(decimated).any())
+
+    def test_interval_histogram_skips_gaps(self):
+        edge_times = np.concatenate([np.arange(10) * 0.01, 3600 + np.arange(10) * 0.01])
+
+        bins, counts = interval_histogram(edge_times, [0, 10])
+
+        self.assertEqual(counts.sum(), 18)
+        self.assertLess(bins[-1], 11)  # No hour-long "interval"
+
+    def test_prepare_series_respects_max_points(self):
+        # 1000 one-second windows with gaps, so most buckets contain a break
+        edge_times = np.concatenate([w * 10 + np.arange(100) * 0.01 for w in range(1000)])
+        run = {
+            'edge_times': edge_times,
+            'window_splits': np.arange(1000) * 100,
+            'window_bounds': np.array([[w * 10, w * 10 + 1.0] for w in range(1000)]),
+            'memory_times': np.arange(10000, dtype=float),
+            'rss_mb': np.linspace(50, 60, 10000),
+            'rapid_times': np.array([]),
+            'spike_times': np.array([])
+        }
+
+        series = prepare_series(run, max_points=2000)
+
+        self.assertLessEqual(len(series['rates']), 2000)
+        self.assertLessEqual(len(series['rss_mb']), 2000)
+
+if __name__ == '__main__':
+    unittest.main()
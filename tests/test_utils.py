@@ -1,5 +1,9 @@
+import io
+import os
+import tempfile
 import unittest
-from src.utils import format_time, log_event
+from contextlib import redirect_stdout
+from src.utils import format_time, log_event, set_console_mode, StatusLine
 
 class TestUtils(unittest.TestCase):
 
@@ -16,5 +20,38 @@ class TestUtils(unittest.TestCase):
         # Here you would check the output of the log, depending on how log_event is implemented
         # This is a placeholder as actual checking would depend on the logging mechanism used
 
+    def test_status_mode_logs_to_file_only(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_file = os.path.join(temp_dir, 'event_log.txt')
+            output = io.StringIO()
+
+            set_console_mode('status')
+            try:
+                with redirect_stdout(output):
+                    log_event("Quiet event", log_file=log_file)
+            finally:
+                set_console_mode('verbose')
+
+            self.assertEqual(output.getvalue(), '')
+            with open(log_file, encoding='utf-8') as f:
+                self.assertIn("Quiet event", f.read())
+
+    def test_status_line_refresh_rate(self):
+        stream = io.StringIO()
+        status_line = StatusLine(refresh_hz=10, stream=stream)
+        renders = []
+
+        def render():
+            renders.append(1)
+            return f"Render {len(renders)}"
+
+        # 1000 updates over one second only redraw at 10Hz
+        for i in range(1000):
+            status_line.update(100 + i / 1000, render)
+        status_line.finish()
+
+        self.assertEqual(len(renders), 10)
+        self.assertTrue(stream.getvalue().endswith('\n'))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file